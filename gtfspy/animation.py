@@ -0,0 +1,358 @@
+from collections import namedtuple
+
+import numpy
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+from gtfspy.routing.connection import Connection
+from gtfspy.route_types import WALK, ROUTE_TYPE_TO_COLOR, ROUTE_TYPE_TO_ZORDER
+
+"""
+This module contains tools for animating journeys (obtained from the routing profilers) on top of a map.
+"""
+
+PlotConnection = namedtuple("PlotConnection",
+                            ["from_lat", "from_lon", "to_lat", "to_lon",
+                             "departure_time", "arrival_time", "route_type"])
+
+
+class JourneyAnimator:
+    """
+    Animates a set of journeys, each drawn as a moving, fading "tail" colored by route type.
+
+    The connections of all journeys are stored concatenated in flat
+    struct-of-arrays NumPy columns with a journey_idx column for grouping, so
+    each frame evaluates activity and tail/head positions for every connection
+    with a handful of bulk array operations.
+    """
+
+    def __init__(self, gtfs, journey_labels, tail_seconds=120, n_frames=100):
+        """
+        Parameters
+        ----------
+        gtfs: gtfspy.gtfs.GTFS
+        journey_labels: list
+            list of labels with route information
+            (e.g. LabelTimeAndRoute or LabelTimeBoardingsAndRoute), one per journey
+        tail_seconds: int, optional
+            how long a tail (in seconds) each journey leaves behind
+        n_frames: int, optional
+            number of animation frames
+        """
+        self._gtfs = gtfs
+        self.tail_seconds = tail_seconds
+        self.n_frames = n_frames
+        (from_lats, from_lons, to_lats, to_lons,
+         departure_times, arrival_times, route_types, journey_indices) = \
+            self.__get_coordinate_augmented_connections_from_labels(journey_labels)
+        self._conn_from_lat = numpy.array(from_lats, dtype=numpy.float64)
+        self._conn_from_lon = numpy.array(from_lons, dtype=numpy.float64)
+        self._conn_to_lat = numpy.array(to_lats, dtype=numpy.float64)
+        self._conn_to_lon = numpy.array(to_lons, dtype=numpy.float64)
+        self._conn_dep = numpy.array(departure_times, dtype=numpy.int64)
+        self._conn_arr = numpy.array(arrival_times, dtype=numpy.int64)
+        self._conn_route_type = numpy.array(route_types, dtype=numpy.int8)
+        self._conn_journey_idx = numpy.array(journey_indices, dtype=numpy.int32)
+        self._n_journeys = len(journey_labels)
+        # connections are stored journey by journey, so each journey is a contiguous slice
+        counts = numpy.bincount(self._conn_journey_idx, minlength=self._n_journeys)
+        ends = numpy.cumsum(counts)
+        self._journey_slices = list(zip(ends - counts, ends))
+
+        # constant endpoint deltas plus scratch buffers reused on every frame by
+        # __compute_overlap_geometry, so the per-frame math allocates nothing
+        n_connections = len(self._conn_dep)
+        self._delta_lat = self._conn_to_lat - self._conn_from_lat
+        self._delta_lon = self._conn_to_lon - self._conn_from_lon
+        self._dur_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._tmp_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._frac_start_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._frac_end_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._tail_lat_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._tail_lon_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._head_lat_buf = numpy.empty(n_connections, dtype=numpy.float64)
+        self._head_lon_buf = numpy.empty(n_connections, dtype=numpy.float64)
+
+        # orderings by departure and arrival time, for finding the connections
+        # possibly active at a frame time with binary search instead of a full scan
+        self._dep_order = numpy.argsort(self._conn_dep)
+        self._sorted_deps = self._conn_dep[self._dep_order]
+        self._arr_order = numpy.argsort(self._conn_arr)
+        self._sorted_arrs = self._conn_arr[self._arr_order]
+
+        self._route_types = sorted(set(int(rt) for rt in route_types))
+        # route_type -> RGBA lookup table (route types offset by one so that WALK=-1 maps to row 0),
+        # so colors are parsed once instead of being re-parsed from strings by matplotlib
+        max_route_type = max(ROUTE_TYPE_TO_COLOR)
+        self._color_lut = numpy.zeros((max_route_type + 2, 4), dtype=numpy.float32)
+        for route_type, color in ROUTE_TYPE_TO_COLOR.items():
+            self._color_lut[route_type + 1] = to_rgba(color)
+        self._line_collections = None
+        self._marker_collection = None
+        self._time_text = None
+        self._frame_times = None
+        self._frame_active = None
+        self._frame_time_to_idx = None
+
+        self._lat_min = min(self._conn_from_lat.min(), self._conn_to_lat.min())
+        self._lat_max = max(self._conn_from_lat.max(), self._conn_to_lat.max())
+        self._lon_min = min(self._conn_from_lon.min(), self._conn_to_lon.min())
+        self._lon_max = max(self._conn_from_lon.max(), self._conn_to_lon.max())
+
+        self._start_time_ut = int(self._conn_dep.min())
+        self._end_time_ut = int(self._conn_arr.max())
+
+    def __get_coordinate_augmented_connections_from_labels(self, journey_labels):
+        """
+        Expand each label chain into flat per-connection columns with stop
+        coordinates and route types attached, plus a journey index column.
+
+        Parameters
+        ----------
+        journey_labels: list
+
+        Returns
+        -------
+        columns: tuple[list]
+            (from_lats, from_lons, to_lats, to_lons,
+             departure_times, arrival_times, route_types, journey_indices)
+        """
+        # first pass: walk the label chains and collect which stops and trips are actually referenced,
+        # so that only those rows are fetched instead of the full stops and trips tables
+        journey_conns = []
+        needed_stops = set()
+        needed_trips = set()
+        for journey_idx, label in enumerate(journey_labels):
+            cur_label = label
+            while cur_label is not None:
+                cur_conn = cur_label.connection
+                if isinstance(cur_conn, Connection):
+                    journey_conns.append((journey_idx, cur_conn))
+                    needed_stops.add(cur_conn.departure_stop)
+                    needed_stops.add(cur_conn.arrival_stop)
+                    if not cur_conn.is_walk:
+                        needed_trips.add(cur_conn.trip_id)
+                cur_label = cur_label.previous_label
+
+        placeholders = ",".join("?" * len(needed_stops))
+        cur = self._gtfs.conn.execute("SELECT stop_I, lat, lon FROM stops WHERE stop_I IN (%s)" % placeholders,
+                                      tuple(needed_stops))
+        stopI_to_pos = {stop_I: (lat, lon) for stop_I, lat, lon in cur}
+        placeholders = ",".join("?" * len(needed_trips))
+        cur = self._gtfs.conn.execute("SELECT trip_I, routes.type FROM trips JOIN routes USING(route_I) "
+                                      "WHERE trip_I IN (%s)" % placeholders,
+                                      tuple(needed_trips))
+        trip_I_to_route_type = {trip_I: route_type for trip_I, route_type in cur}
+
+        from_lats = []
+        from_lons = []
+        to_lats = []
+        to_lons = []
+        departure_times = []
+        arrival_times = []
+        route_types = []
+        journey_indices = []
+        for journey_idx, cur_conn in journey_conns:
+            from_lat, from_lon = stopI_to_pos[cur_conn.departure_stop]
+            to_lat, to_lon = stopI_to_pos[cur_conn.arrival_stop]
+            if cur_conn.is_walk:
+                route_type = WALK
+            else:
+                route_type = trip_I_to_route_type[cur_conn.trip_id]
+            from_lats.append(from_lat)
+            from_lons.append(from_lon)
+            to_lats.append(to_lat)
+            to_lons.append(to_lon)
+            departure_times.append(cur_conn.departure_time)
+            arrival_times.append(cur_conn.arrival_time)
+            route_types.append(route_type)
+            journey_indices.append(journey_idx)
+        return (from_lats, from_lons, to_lats, to_lons,
+                departure_times, arrival_times, route_types, journey_indices)
+
+    def get_plot_connections(self):
+        """
+        Reconstruct per-journey PlotConnection lists from the flat arrays.
+        Intended for debugging and inspection; the arrays themselves are the
+        canonical representation used by the animation.
+
+        Returns
+        -------
+        journey_connections: list[list[PlotConnection]]
+        """
+        journey_connections = [[] for _ in range(self._n_journeys)]
+        # tolist() unboxes each column once instead of boxing a NumPy scalar per element access
+        rows = zip(self._conn_from_lat.tolist(), self._conn_from_lon.tolist(),
+                   self._conn_to_lat.tolist(), self._conn_to_lon.tolist(),
+                   self._conn_dep.tolist(), self._conn_arr.tolist(),
+                   self._conn_route_type.tolist())
+        for journey_idx, row in zip(self._conn_journey_idx.tolist(), rows):
+            journey_connections[journey_idx].append(PlotConnection(*row))
+        return journey_connections
+
+    def __init_artists(self, ax):
+        """
+        Create the persistent LineCollections (one per route type) and the marker
+        PathCollection whose data is updated in-place on each frame.
+        """
+        self._line_collections = {}
+        for rt in self._route_types:
+            line_collection = LineCollection([],
+                                             colors=self._color_lut[rt + 1],
+                                             zorder=ROUTE_TYPE_TO_ZORDER[rt])
+            ax.add_collection(line_collection)
+            self._line_collections[rt] = line_collection
+        self._marker_collection = ax.scatter([], [], s=25, color="black", zorder=20)
+        # the frame time is drawn as an in-axes text, as a title would fall outside the blitted region
+        self._time_text = ax.text(0.02, 0.98, "", transform=ax.transAxes, va="top", zorder=30)
+
+    def __compute_active_mask(self, time_ut, tail):
+        """
+        Compute the boolean mask of connections active in the window [tail, time_ut].
+
+        A connection is active if arrival_time >= tail and departure_time <= time_ut.
+        If the activity of all frames was precomputed in animation(), the mask is
+        just read off that matrix. Otherwise binary search on the time-sorted
+        orderings narrows the candidates down to whichever one-sided condition
+        matches fewer connections, so only those are checked against the other
+        condition instead of scanning everything.
+        """
+        if self._frame_active is not None and time_ut in self._frame_time_to_idx:
+            return self._frame_active[self._frame_time_to_idx[time_ut]]
+        n = len(self._conn_dep)
+        n_departed = numpy.searchsorted(self._sorted_deps, time_ut, side="right")
+        n_not_passed = n - numpy.searchsorted(self._sorted_arrs, tail, side="left")
+        active = numpy.zeros(n, dtype=bool)
+        if n_departed <= n_not_passed:
+            candidates = self._dep_order[:n_departed]
+            active[candidates[self._conn_arr[candidates] >= tail]] = True
+        else:
+            candidates = self._arr_order[n - n_not_passed:]
+            active[candidates[self._conn_dep[candidates] <= time_ut]] = True
+        return active
+
+    def __compute_overlap_geometry(self, time_ut, tail):
+        """
+        Fill the preallocated scratch buffers with each connection's tail/head
+        fractions and endpoint coordinates for the window [tail, time_ut].
+
+        All operations write into the reusable buffers (ufunc out=), so no
+        temporary arrays are allocated per frame. The computation is branchless:
+        clamping the duration to at least one keeps the fractions within [0, 1]
+        for every connection, and a zero-duration connection gets
+        frac_start == frac_end == 0, i.e. its segment degenerates to a point.
+        """
+        dep = self._conn_dep
+        arr = self._conn_arr
+        numpy.subtract(arr, dep, out=self._dur_buf)
+        numpy.maximum(self._dur_buf, 1, out=self._dur_buf)
+        numpy.clip(tail, dep, arr, out=self._tmp_buf)
+        numpy.subtract(self._tmp_buf, dep, out=self._tmp_buf)
+        numpy.divide(self._tmp_buf, self._dur_buf, out=self._frac_start_buf)
+        numpy.clip(time_ut, dep, arr, out=self._tmp_buf)
+        numpy.subtract(self._tmp_buf, dep, out=self._tmp_buf)
+        numpy.divide(self._tmp_buf, self._dur_buf, out=self._frac_end_buf)
+        numpy.multiply(self._frac_start_buf, self._delta_lat, out=self._tail_lat_buf)
+        numpy.add(self._tail_lat_buf, self._conn_from_lat, out=self._tail_lat_buf)
+        numpy.multiply(self._frac_start_buf, self._delta_lon, out=self._tail_lon_buf)
+        numpy.add(self._tail_lon_buf, self._conn_from_lon, out=self._tail_lon_buf)
+        numpy.multiply(self._frac_end_buf, self._delta_lat, out=self._head_lat_buf)
+        numpy.add(self._head_lat_buf, self._conn_from_lat, out=self._head_lat_buf)
+        numpy.multiply(self._frac_end_buf, self._delta_lon, out=self._head_lon_buf)
+        numpy.add(self._head_lon_buf, self._conn_from_lon, out=self._head_lon_buf)
+
+    def __plot_paths(self, time_ut):
+        """
+        Update the persistent artists to show the state of all journeys at time_ut.
+        """
+        tail = time_ut - self.tail_seconds
+        arr = self._conn_arr
+        active = self.__compute_active_mask(time_ut, tail)
+        self.__compute_overlap_geometry(time_ut, tail)
+        tail_lats = self._tail_lat_buf
+        tail_lons = self._tail_lon_buf
+        head_lats = self._head_lat_buf
+        head_lons = self._head_lon_buf
+
+        for rt, line_collection in self._line_collections.items():
+            selected = active & (self._conn_route_type == rt)
+            if selected.any():
+                segments = numpy.stack(
+                    (numpy.column_stack((tail_lons[selected], tail_lats[selected])),
+                     numpy.column_stack((head_lons[selected], head_lats[selected]))),
+                    axis=1
+                )
+                line_collection.set_segments(segments)
+            else:
+                line_collection.set_segments([])
+
+        marker_offsets = []
+        for start, end in self._journey_slices:
+            journey_active = active[start:end]
+            if journey_active.any():
+                head_index = start + numpy.nonzero(journey_active)[0][-1]
+                marker_offsets.append((head_lons[head_index], head_lats[head_index]))
+            else:
+                # the journey has no active connection: mark the most recently reached
+                # stop, found by binary search on the journey's sorted arrival times
+                i = numpy.searchsorted(arr[start:end], time_ut, side="left") - 1
+                if i >= 0:
+                    marker_offsets.append((self._conn_to_lon[start + i], self._conn_to_lat[start + i]))
+        if marker_offsets:
+            self._marker_collection.set_offsets(marker_offsets)
+        else:
+            self._marker_collection.set_offsets(numpy.empty((0, 2)))
+
+    def __frame_artists(self):
+        return tuple(self._line_collections.values()) + (self._marker_collection, self._time_text)
+
+    def __init_frame(self):
+        for line_collection in self._line_collections.values():
+            line_collection.set_segments([])
+        self._marker_collection.set_offsets(numpy.empty((0, 2)))
+        self._time_text.set_text("")
+        return self.__frame_artists()
+
+    def __animation_frame(self, time_ut):
+        self.__plot_paths(time_ut)
+        self._time_text.set_text(str(self._gtfs.unixtime_seconds_to_gtfs_datetime(time_ut)))
+        return self.__frame_artists()
+
+    def animation(self, fps=10):
+        """
+        Construct the journey animation.
+
+        Parameters
+        ----------
+        fps: int, optional
+            frames per second of the returned animation
+
+        Returns
+        -------
+        animation: matplotlib.animation.FuncAnimation
+        """
+        fig, ax = plt.subplots()
+        lat_margin = 0.02 * (self._lat_max - self._lat_min) + 0.001
+        lon_margin = 0.02 * (self._lon_max - self._lon_min) + 0.001
+        ax.set_xlim(self._lon_min - lon_margin, self._lon_max + lon_margin)
+        ax.set_ylim(self._lat_min - lat_margin, self._lat_max + lat_margin)
+        ax.set_xlabel("Longitude (deg)")
+        ax.set_ylabel("Latitude (deg)")
+        self.__init_artists(ax)
+        # int64 frame times, so comparisons against the int64 connection times need no casting
+        frame_times = numpy.linspace(self._start_time_ut,
+                                     self._end_time_ut + self.tail_seconds,
+                                     num=self.n_frames).astype(numpy.int64)
+        self._frame_times = frame_times
+        # for moderate inputs, trade memory for compute and evaluate every frame's
+        # activity mask in one broadcast up front
+        if len(frame_times) * len(self._conn_dep) < 5e7:
+            self._frame_active = \
+                (self._conn_arr[None, :] >= frame_times[:, None] - self.tail_seconds) & \
+                (self._conn_dep[None, :] <= frame_times[:, None])
+            self._frame_time_to_idx = {time_ut: idx for idx, time_ut in enumerate(frame_times.tolist())}
+        anim = FuncAnimation(fig, self.__animation_frame, frames=frame_times,
+                             init_func=self.__init_frame, interval=1000. / fps, blit=True)
+        return anim
@@ -1,3 +1,5 @@
+import numpy
+
 from gtfspy.routing.connection import Connection
 
 
@@ -9,6 +11,10 @@ class ForwardJourney:
     - walking trips do not have a trip_id
     """
 
+    __slots__ = ("legs", "departure_time", "arrival_time", "n_boardings", "_last_trip_id",
+                 "_total_waiting_time", "_total_invehicle_time", "_total_walking_time",
+                 "_trip_ids_list", "_dep_stops", "_arr_stops")
+
     def __init__(self, legs=None):
         """
         Parameters
@@ -18,8 +24,14 @@ class ForwardJourney:
         self.legs = []
         self.departure_time = None
         self.arrival_time = None
-        self.trip_ids = set()
         self.n_boardings = 0
+        self._last_trip_id = None
+        self._total_waiting_time = 0
+        self._total_invehicle_time = 0
+        self._total_walking_time = 0
+        self._trip_ids_list = []
+        self._dep_stops = []
+        self._arr_stops = []
         if legs is not None:
             for leg in legs:
                 self.add_leg(leg)
@@ -30,13 +42,22 @@ class ForwardJourney:
         ----------
         leg: Connection
         """
-        assert(isinstance(leg, Connection))
         if not self.legs:
             self.departure_time = leg.departure_time
+        else:
+            self._total_waiting_time += leg.departure_time - self.arrival_time
+        trip_id = leg.trip_id
+        if trip_id is not None:
+            self._total_invehicle_time += leg.duration()
+            if trip_id and trip_id != self._last_trip_id:
+                self.n_boardings += 1
+        if leg.is_walk:
+            self._total_walking_time += leg.duration() - getattr(leg, "waiting_time", 0)
+        self._last_trip_id = trip_id
         self.arrival_time = leg.arrival_time
-        if leg.trip_id and (not self.legs or (leg.trip_id != self.legs[-1].trip_id)):
-            self.n_boardings += 1
-        self.arrival_time = leg.arrival_time
+        self._trip_ids_list.append(trip_id)
+        self._dep_stops.append(leg.departure_stop)
+        self._arr_stops.append(leg.arrival_stop)
         self.legs.append(leg)
 
     def get_legs(self):
@@ -64,16 +85,14 @@ class ForwardJourney:
         -------
         transfer_stop_pairs: list
         """
-        transfer_stop_pairs = []
-        previous_arrival_stop = None
-        current_trip_id = None
-        for leg in self.legs:
-            if leg.trip_id is not None and leg.trip_id != current_trip_id and previous_arrival_stop is not None:
-                transfer_stop_pair = (previous_arrival_stop, leg.departure_stop)
-                transfer_stop_pairs.append(transfer_stop_pair)
-            previous_arrival_stop = leg.arrival_stop
-            current_trip_id = leg.trip_id
-        return transfer_stop_pairs
+        if len(self.legs) < 2:
+            return []
+        trip_ids = numpy.array(self._trip_ids_list, dtype=object)
+        dep_stops = numpy.array(self._dep_stops, dtype=object)
+        arr_stops = numpy.array(self._arr_stops, dtype=object)
+        # a transfer happens wherever a vehicle leg starts on a different trip than the leg before it
+        mask = numpy.not_equal(trip_ids[1:], None) & (trip_ids[1:] != trip_ids[:-1])
+        return list(zip(arr_stops[:-1][mask], dep_stops[1:][mask]))
 
     def get_transfer_trip_pairs(self):
         pass
@@ -89,9 +108,8 @@ class ForwardJourney:
         return waiting_times
 
     def get_total_waiting_time(self):
-        waiting_times = self.get_waiting_times()
-        waiting_total = sum(waiting_times)
-        return waiting_total
+        # maintained incrementally in add_leg, so no need to re-traverse the legs
+        return self._total_waiting_time
 
     def get_invehicle_times(self):
         invehicle_times = []
@@ -102,7 +120,7 @@ class ForwardJourney:
         return invehicle_times
 
     def get_total_invehicle_time(self):
-        return sum(self.get_invehicle_times())
+        return self._total_invehicle_time
 
     def get_walking_times(self):
         walking_times = []
@@ -112,7 +130,26 @@ class ForwardJourney:
         return walking_times
 
     def get_total_walking_time(self):
-        return sum(self.get_walking_times())
+        return self._total_walking_time
+
+    @staticmethod
+    def to_arrays(journeys):
+        """
+        Stack the dominance-relevant attributes of the given journeys into
+        parallel NumPy arrays, for use with gtfspy.routing.pareto_pruning.
+
+        Parameters
+        ----------
+        journeys: list[ForwardJourney]
+
+        Returns
+        -------
+        departure_times, arrival_times, n_boardings: numpy.ndarray
+        """
+        departure_times = numpy.array([journey.departure_time for journey in journeys], dtype=numpy.int64)
+        arrival_times = numpy.array([journey.arrival_time for journey in journeys], dtype=numpy.int64)
+        n_boardings = numpy.array([journey.n_boardings for journey in journeys], dtype=numpy.int64)
+        return departure_times, arrival_times, n_boardings
 
     def dominates(self, other, consider_time=True, consider_boardings=True):
         if consider_time:
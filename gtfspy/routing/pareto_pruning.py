@@ -0,0 +1,63 @@
+import numpy
+
+"""
+Array-based Pareto-front pruning of journey candidates.
+
+ForwardJourney.dominates compares one pair of journeys at a time, so pruning a
+candidate set with it costs O(N^2) Python-level calls. The functions here
+operate on parallel NumPy arrays (see ForwardJourney.to_arrays) and evaluate
+the full dominance relation with bulk array operations instead.
+"""
+
+
+def compute_pareto_front_mask(departure_times, arrival_times, n_boardings):
+    """
+    Compute which journeys belong to the Pareto front.
+
+    A journey is dominated if some other journey departs no earlier, arrives no
+    later, and has no more boardings. Of journeys that are equal in all three
+    respects, only the first one is kept.
+
+    Parameters
+    ----------
+    departure_times: numpy.ndarray
+    arrival_times: numpy.ndarray
+    n_boardings: numpy.ndarray
+
+    Returns
+    -------
+    keep: numpy.ndarray
+        boolean array, True for journeys on the Pareto front
+    """
+    dep = numpy.asarray(departure_times)
+    arr = numpy.asarray(arrival_times)
+    nb = numpy.asarray(n_boardings)
+    n = len(dep)
+    # weak[j, i] is True if journey j weakly dominates journey i
+    weak = (dep[:, None] >= dep[None, :]) & \
+           (arr[:, None] <= arr[None, :]) & \
+           (nb[:, None] <= nb[None, :])
+    strict = weak & ~weak.T
+    # break ties between identical journeys by index, so one of them is kept
+    index = numpy.arange(n)
+    tie = weak & weak.T & (index[:, None] < index[None, :])
+    dominated = (strict | tie).any(axis=0)
+    return ~dominated
+
+
+def prune_dominated_journeys(journeys):
+    """
+    Return the journeys on the Pareto front of the given candidate set.
+
+    Parameters
+    ----------
+    journeys: list[gtfspy.routing.forwardjourney.ForwardJourney]
+
+    Returns
+    -------
+    pruned: list[gtfspy.routing.forwardjourney.ForwardJourney]
+    """
+    from gtfspy.routing.forwardjourney import ForwardJourney
+    departure_times, arrival_times, n_boardings = ForwardJourney.to_arrays(journeys)
+    keep = compute_pareto_front_mask(departure_times, arrival_times, n_boardings)
+    return [journey for journey, kept in zip(journeys, keep) if kept]
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy
+
+from gtfspy.routing.connection import Connection
+from gtfspy.routing.forwardjourney import ForwardJourney
+from gtfspy.routing.pareto_pruning import compute_pareto_front_mask, prune_dominated_journeys
+
+
+class ParetoPruningTest(unittest.TestCase):
+
+    def test_compute_pareto_front_mask(self):
+        departure_times = numpy.array([0, 0, 5, 5])
+        arrival_times = numpy.array([10, 20, 10, 10])
+        n_boardings = numpy.array([1, 1, 1, 1])
+        keep = compute_pareto_front_mask(departure_times, arrival_times, n_boardings)
+        # journeys 0 and 1 are dominated by journey 2;
+        # journey 3 equals journey 2, and only the first of the two is kept
+        self.assertEqual(list(keep), [False, False, True, False])
+
+    def test_mask_matches_pairwise_dominates(self):
+        journeys = []
+        for departure_time, arrival_time, trip_id in [(0, 10, "a"), (2, 10, "b"), (0, 8, "c"), (3, 20, "d")]:
+            leg = Connection(departure_stop=0, arrival_stop=1, departure_time=departure_time,
+                             arrival_time=arrival_time, trip_id=trip_id, seq=1)
+            journeys.append(ForwardJourney(legs=[leg]))
+        keep = compute_pareto_front_mask(*ForwardJourney.to_arrays(journeys))
+        for i, journey in enumerate(journeys):
+            dominated = any(other.dominates(journey) for j, other in enumerate(journeys) if j != i)
+            self.assertEqual(keep[i], not dominated)
+
+    def test_prune_dominated_journeys(self):
+        leg_fast = Connection(departure_stop=0, arrival_stop=1, departure_time=5,
+                              arrival_time=10, trip_id="a", seq=1)
+        leg_slow = Connection(departure_stop=0, arrival_stop=1, departure_time=0,
+                              arrival_time=15, trip_id="b", seq=1)
+        fast = ForwardJourney(legs=[leg_fast])
+        slow = ForwardJourney(legs=[leg_slow])
+        pruned = prune_dominated_journeys([slow, fast])
+        self.assertEqual(pruned, [fast])
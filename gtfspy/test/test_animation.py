@@ -0,0 +1,55 @@
+import os
+import sqlite3
+import unittest
+
+from matplotlib.animation import FuncAnimation
+
+from gtfspy.gtfs import GTFS
+from gtfspy.import_gtfs import import_gtfs
+from gtfspy.animation import JourneyAnimator
+from gtfspy.routing.connection import Connection
+from gtfspy.routing.label import LabelTimeAndRoute
+
+
+class TestAnimation(unittest.TestCase):
+
+    def setUp(self):
+        self.gtfs_source_dir = os.path.join(os.path.dirname(__file__), "test_data")
+        self.fname = self.gtfs_source_dir + "/test_gtfs.sqlite"
+        conn = sqlite3.connect(self.fname)
+        import_gtfs(self.gtfs_source_dir, conn, preserve_connection=True, print_progress=False)
+        self.G = GTFS(conn)
+
+    def tearDown(self):
+        if os.path.exists(self.fname) and os.path.isfile(self.fname):
+            os.remove(self.fname)
+
+    def _get_test_journey_labels(self):
+        # construct a two-leg journey (transit + walk) over stops of the test feed
+        stop_Is = [row[0] for row in self.G.conn.execute("SELECT stop_I FROM stops LIMIT 3")]
+        trip_I = self.G.conn.execute("SELECT trip_I FROM trips LIMIT 1").fetchone()[0]
+        leg1 = Connection(departure_stop=stop_Is[0], arrival_stop=stop_Is[1],
+                          departure_time=1000, arrival_time=1100, trip_id=trip_I, seq=1)
+        leg2 = Connection(departure_stop=stop_Is[1], arrival_stop=stop_Is[2],
+                          departure_time=1150, arrival_time=1250,
+                          trip_id=None, seq=Connection.WALK_SEQ, is_walk=True)
+        end_label = LabelTimeAndRoute(leg2.departure_time, float(leg2.arrival_time), 100, True,
+                                      connection=leg2, previous_label=None)
+        start_label = LabelTimeAndRoute(leg1.departure_time, float(leg2.arrival_time), 200, False,
+                                        connection=leg1, previous_label=end_label)
+        return [start_label]
+
+    def test_journey_animator(self):
+        animator = JourneyAnimator(self.G, self._get_test_journey_labels(),
+                                   tail_seconds=30, n_frames=4)
+        journey_connections = animator.get_plot_connections()
+        self.assertEqual(len(journey_connections), 1)
+        self.assertEqual(len(journey_connections[0]), 2)
+        self.assertTrue(animator._lat_min <= animator._lat_max)
+        self.assertTrue(animator._lon_min <= animator._lon_max)
+
+        anim = animator.animation()
+        self.assertIsInstance(anim, FuncAnimation)
+        # render the frames to make sure the whole pipeline works
+        html = anim.to_jshtml()
+        self.assertTrue(len(html) > 0)